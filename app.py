@@ -1,95 +1,160 @@
-import io
 import logging
+import os
+import re
 import shutil
+import threading
+import time
 import uuid
+from collections import deque
 from pathlib import Path
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
-import pandas as pd
 import streamlit as st
 
 from plugins_class import (
+    PDFCache,
+    PDFDownloader,
     PDFDownloadManager,
     UnpaywallDownloader,
     CrossrefDownloader,
     SciHubDownloader,
+    build_session,
 )
 from utility import headers, scihub_mirrors
 
+# Default and upper bound for the number of DOIs downloaded in parallel (the work is network-bound)
+CONCURRENCY = 5
+MAX_CONCURRENCY = 16
+
+# Seconds between UI refreshes while the background worker is running
+POLL_INTERVAL = 0.75
+
+# Log lines kept for display (older lines are evicted) and the text cap for the widget
+MAX_LOG_LINES = 500
+MAX_LOG_CHARS = 100_000
+
+# DOI pattern used to pull DOIs out of pasted lines (URLs, doi: prefix, etc.)
+_DOI_RE = re.compile(r'10\.\d{4,9}/\S+')
+
+
+class LogBuffer(deque):
+    """Bounded log deque whose version increases on every append, so the UI can
+    tell whether the joined log text needs rebuilding."""
+
+    def __init__(self, maxlen: int = MAX_LOG_LINES):
+        super().__init__(maxlen=maxlen)
+        self.version = 0
+
+    def append(self, item) -> None:
+        super().append(item)
+        self.version += 1
+
 
 # --- Helpers: session state management ---
 def _init_state():
     st.session_state.setdefault("uploaded_file", None)
     st.session_state.setdefault("dois", [])
     st.session_state.setdefault("total", 0)
-    st.session_state.setdefault("current_index", 0)
     st.session_state.setdefault("running", False)
     st.session_state.setdefault("stop", False)
-    st.session_state.setdefault("logs", [])
+    st.session_state.setdefault("stop_event", None)
+    st.session_state.setdefault("worker", None)
+    st.session_state.setdefault("logs", LogBuffer())
     st.session_state.setdefault("run_dir", None)
     st.session_state.setdefault("manager", None)
     st.session_state.setdefault("results_saved", False)
     st.session_state.setdefault("zip_ready", False)
-    st.session_state.setdefault("zip_bytes", None)
+    st.session_state.setdefault("zip_path", None)
 
 
 class StreamlitLogHandler(logging.Handler):
+    # Worker threads have no Streamlit script context, so records are written to the
+    # run's own log buffer rather than st.session_state. One handler is attached per
+    # run and only accepts records from that run's threads (see _thread_prefix in
+    # plugins_class), so concurrent sessions don't see each other's logs.
+
+    def __init__(self, logs: LogBuffer, thread_name: str):
+        super().__init__()
+        self.logs = logs
+        self.thread_name = thread_name
+        self.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(threadName)s - %(message)s", datefmt="%H:%M:%S"))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        name = record.threadName or ""
+        return (name == self.thread_name or name.startswith(self.thread_name + "-")) and super().filter(record)
+
     def emit(self, record: logging.LogRecord) -> None:
         try:
             msg = self.format(record)
         except Exception:
             msg = record.getMessage()
-        st.session_state.logs.append(msg)
+        self.logs.append(msg)
 
 
 def _attach_logging():
-    # Configure root logger once per run
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
+    # Per-run handlers are added in _prepare_manager; here only make sure INFO records get through
+    logging.getLogger().setLevel(logging.INFO)
+
 
-    # Avoid adding duplicate handlers across reruns
-    if not any(isinstance(h, StreamlitLogHandler) for h in logger.handlers):
-        sh = StreamlitLogHandler()
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s", datefmt="%H:%M:%S")
-        sh.setFormatter(formatter)
-        logger.addHandler(sh)
+def build_strategies(run_dir: str) -> tuple[PDFDownloader, ...]:
+    # Built once per run when it starts; the strategies share one pooled session
+    download_dir = Path(run_dir)
+    session = build_session()
+    return (
+        UnpaywallDownloader(headers=headers, download_dir=download_dir, session=session),
+        CrossrefDownloader(headers=headers, download_dir=download_dir, session=session),
+        SciHubDownloader(headers=headers, download_dir=download_dir, mirrors=scihub_mirrors, session=session),
+    )
 
 
-def _prepare_manager(dois: list[str]):
+def _prepare_manager(dois: list[str], max_workers: int = CONCURRENCY):
     run_root = Path("streamlit_runs")
     run_root.mkdir(parents=True, exist_ok=True)
     run_dir = run_root / f"run_{uuid.uuid4().hex[:8]}"
     run_dir.mkdir(parents=True, exist_ok=True)
 
-    strategies = [
-        UnpaywallDownloader(headers=headers, download_dir=run_dir),
-        CrossrefDownloader(headers=headers, download_dir=run_dir),
-        SciHubDownloader(headers=headers, download_dir=run_dir, mirrors=scihub_mirrors),
-    ]
-    manager = PDFDownloadManager(strategies=strategies, download_dir=run_dir)
+    strategies = build_strategies(str(run_dir))
+    manager = PDFDownloadManager(
+        strategies=strategies,
+        download_dir=run_dir,
+        cache=PDFCache(),
+        max_workers=max_workers,
+    )
+    stop_event = threading.Event()
+    # The worker and every thread it spawns are named after the run, which is how
+    # the run's log handler picks out its records
+    log_handler = StreamlitLogHandler(st.session_state.logs, run_dir.name)
+    logging.getLogger().addHandler(log_handler)
+    worker = threading.Thread(
+        target=_run_all,
+        args=(manager, dois, stop_event, log_handler),
+        name=run_dir.name,
+        daemon=True,
+    )
 
     st.session_state.run_dir = str(run_dir)
     st.session_state.manager = manager
     st.session_state.dois = dois
     st.session_state.total = len(dois)
-    st.session_state.current_index = 0
     st.session_state.running = True
     st.session_state.stop = False
+    st.session_state.stop_event = stop_event
+    st.session_state.worker = worker
     st.session_state.results_saved = False
     st.session_state.zip_ready = False
-    st.session_state.zip_bytes = None
+    st.session_state.zip_path = None
+    worker.start()
 
 
-def _process_one():
-    # Process exactly one DOI per rerun to keep UI responsive (supports Stop)
-    i = st.session_state.current_index
-    if i >= st.session_state.total:
-        return
-
-    doi = st.session_state.dois[i]
-    manager: PDFDownloadManager = st.session_state.manager
-    manager.download(doi)
-    st.session_state.current_index = i + 1
+def _run_all(manager: PDFDownloadManager, dois: list[str], stop_event: threading.Event, log_handler: logging.Handler):
+    # Runs in a background thread so downloads are decoupled from Streamlit reruns.
+    # Only touches objects passed in: st.session_state is not available off the script thread.
+    # The manager prefetches metadata and fans out over max_workers threads itself.
+    try:
+        manager.download(dois, stop_event=stop_event)
+    finally:
+        manager.close()
+        logging.getLogger().removeHandler(log_handler)
 
 
 def _finalize_outputs():
@@ -101,25 +166,33 @@ def _finalize_outputs():
     # Save CSV summary
     manager.save_results_to_csv()
 
-    # Build ZIP in-memory for download
+    # Build ZIP on disk, streaming each file in 1 MB blocks so memory stays flat.
+    # PDFs are already compressed internally, so they are stored as-is.
     run_dir = Path(st.session_state.run_dir)
-    zip_buffer = io.BytesIO()
-    with ZipFile(zip_buffer, mode="w", compression=ZIP_DEFLATED) as zf:
+    zip_path = run_dir / "results.zip"
+    with ZipFile(zip_path, mode="w", compression=ZIP_STORED, allowZip64=True) as zf:
         # Add all PDFs
-        for pdf in run_dir.glob("*.pdf"):
-            zf.write(pdf, arcname=pdf.name)
+        with os.scandir(run_dir) as entries:
+            for entry in entries:
+                if not (entry.name.endswith(".pdf") and entry.is_file()):
+                    continue
+                with open(entry.path, "rb") as src, zf.open(entry.name, "w", force_zip64=True) as dest:
+                    shutil.copyfileobj(src, dest, length=1 << 20)
         # Add CSV report if present
         csv_path = run_dir / "download_summary.csv"
         if csv_path.exists():
-            zf.write(csv_path, arcname=csv_path.name)
-    zip_buffer.seek(0)
+            zf.write(csv_path, arcname=csv_path.name, compress_type=ZIP_DEFLATED)
 
-    st.session_state.zip_bytes = zip_buffer.read()
+    st.session_state.zip_path = str(zip_path)
     st.session_state.zip_ready = True
     st.session_state.results_saved = True
 
 
 def _reset():
+    # Cancel a running worker before removing its directory
+    stop_event = st.session_state.get("stop_event")
+    if stop_event is not None:
+        stop_event.set()
     # Clean temp directory
     run_dir = st.session_state.get("run_dir")
     if run_dir:
@@ -132,21 +205,22 @@ def _reset():
         "uploaded_file",
         "dois",
         "total",
-        "current_index",
         "running",
         "stop",
+        "stop_event",
+        "worker",
         "logs",
         "run_dir",
         "manager",
         "results_saved",
         "zip_ready",
-        "zip_bytes",
+        "zip_path",
     ]:
         if k == "logs":
-            st.session_state[k] = []
+            st.session_state[k] = LogBuffer()
         elif k in ("running", "stop", "results_saved", "zip_ready"):
             st.session_state[k] = False
-        elif k in ("total", "current_index"):
+        elif k == "total":
             st.session_state[k] = 0
         else:
             st.session_state[k] = None
@@ -168,6 +242,15 @@ doi_input = st.text_area(
     key="doi_text_input"
 )
 
+concurrency = st.slider(
+    "Parallel downloads",
+    min_value=1,
+    max_value=MAX_CONCURRENCY,
+    value=CONCURRENCY,
+    help="Number of DOIs processed at the same time",
+    disabled=st.session_state.running,
+)
+
 col1, col2, col3, col4 = st.columns(4)
 with col1:
     run_clicked = st.button("Start Downloading", type="primary")
@@ -176,15 +259,16 @@ with col2:
 with col3:
     reset_clicked = st.button("Reset")
 with col4:
-    download_ready = st.session_state.zip_ready and st.session_state.zip_bytes is not None
+    download_ready = st.session_state.zip_ready and st.session_state.zip_path is not None
     if download_ready:
-        st.download_button(
-            label="Download Finally",
-            data=st.session_state.zip_bytes,
-            file_name="paper_hunter_results.zip",
-            mime="application/zip",
-            key="download_final_zip",
-        )
+        with open(st.session_state.zip_path, "rb") as zip_file:
+            st.download_button(
+                label="Download Finally",
+                data=zip_file,
+                file_name="paper_hunter_results.zip",
+                mime="application/zip",
+                key="download_final_zip",
+            )
     else:
         st.button("Download Finally", disabled=True, key="download_final_disabled")
 
@@ -196,6 +280,7 @@ if reset_clicked:
 
 if stop_clicked and st.session_state.running:
     st.session_state.stop = True
+    st.session_state.stop_event.set()
 
 if run_clicked:
     if not doi_input or not doi_input.strip():
@@ -209,11 +294,9 @@ if run_clicked:
             cleaned = line.strip()
             if cleaned:
                 # Handle various DOI formats (URLs, doi: prefix, etc.)
-                # Extract DOI pattern if present
-                import re
-                doi_match = re.search(r'(10\.\d{4,9}/[^\s]+)', cleaned)
+                doi_match = _DOI_RE.search(cleaned)
                 if doi_match:
-                    dois.append(doi_match.group(1))
+                    dois.append(doi_match.group(0))
                 elif cleaned.startswith('10.'):
                     dois.append(cleaned)
         
@@ -221,25 +304,32 @@ if run_clicked:
             st.error("No valid DOIs found. DOIs should start with '10.' (e.g., 10.1016/j.jclinepi.2022.01.014)")
             st.stop()
 
-        st.session_state.logs = []
-        _prepare_manager(dois)
+        # Order-preserving dedup so a DOI pasted twice is only fetched once
+        unique_dois = list(dict.fromkeys(dois))
+        duplicates = len(dois) - len(unique_dois)
+        dois = unique_dois
+
+        st.session_state.logs = LogBuffer()
+        if duplicates:
+            st.session_state.logs.append(f"Removed {duplicates} duplicate DOI(s).")
+            st.info(f"Removed {duplicates} duplicate DOI(s).")
+        _prepare_manager(dois, max_workers=concurrency)
         st.info(f"Loaded {len(dois)} DOI(s). Starting downloads…")
         st.rerun()
 
 
 # Progress and logs
 total = st.session_state.total
-idx = st.session_state.current_index
 running = st.session_state.running
-stop_flag = st.session_state.stop
+worker = st.session_state.worker
+worker_alive = worker is not None and worker.is_alive()
 
 # Metrics: successes / failures / remaining
 succ = fail = 0
 if st.session_state.manager is not None:
-    res = getattr(st.session_state.manager, "results", []) or []
-    succ = sum(1 for r in res if r.get("success") is True)
-    fail = sum(1 for r in res if r.get("success") is False)
+    succ, fail = st.session_state.manager.result_counts()
 remaining = max(total - (succ + fail), 0)
+idx = succ + fail
 
 m1, m2, m3 = st.columns(3)
 with m1:
@@ -253,18 +343,28 @@ if total > 0:
     pct = int(100 * idx / total)
     st.progress(pct, text=f"Progress: {idx}/{total}")
 
-log_text = "\n".join(st.session_state.logs[-500:])  # keep last 500 lines
-st.text_area("Logs", value=log_text, height=240)
+# Re-join the log text only when the buffer changed since the last render
+logs = st.session_state.logs
+log_version = logs.version  # read before joining so a concurrent append triggers a re-join next time
+if st.session_state.get("_log_source") is not logs or st.session_state.get("_log_version") != log_version:
+    st.session_state["_log_text"] = "\n".join(logs)[-MAX_LOG_CHARS:]
+    st.session_state["_log_source"] = logs
+    st.session_state["_log_version"] = log_version
+st.text_area("Logs", value=st.session_state["_log_text"], height=240)
+
+if st.button("Clear cache", help="Delete PDFs cached from previous runs", disabled=running):
+    PDFCache().clear()
+    st.success("PDF cache cleared.")
 
 
-# Incremental processing
-if running and not stop_flag and idx < total:
-    _process_one()
-    # Trigger rerun to respond to Stop promptly and update UI
+# Poll the background worker; reruns only refresh the UI, they don't drive downloads
+if running and worker_alive:
+    time.sleep(POLL_INTERVAL)
     st.rerun()
 
-# Finalization when done or stopped
-if total > 0 and (idx >= total or stop_flag) and not st.session_state.results_saved:
+# Finalization when the worker has finished or was stopped
+if total > 0 and not worker_alive and not st.session_state.results_saved:
     _finalize_outputs()
+    st.session_state.running = False
     # Rerun so the 'Download Finally' button becomes active immediately
     st.rerun()
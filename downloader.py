@@ -1,81 +1,56 @@
 # %%
-import requests
+import os
 from pathlib import Path
-# Ensure BeautifulSoup is available; attempt to install if missing.
-try:
-    from bs4 import BeautifulSoup
-except ModuleNotFoundError:
-    import sys, subprocess
-    print("Missing dependency 'bs4' (beautifulsoup4). Attempting to install via pip...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "beautifulsoup4", "lxml"])
-    from bs4 import BeautifulSoup
-from utility import _sanitize_doi
-import random
-from urllib.parse import urljoin
 import logging
-import numpy as np
-import pandas as pd
+from functools import lru_cache
+from typing import TYPE_CHECKING
 from plugins_class import (
     UnpaywallDownloader,
     CrossrefDownloader,
     SciHubDownloader,
+    PDFCache,
     PDFDownloadManager,
+    build_session,
 )
 from utility import headers as _global_headers, scihub_mirrors as _global_mirrors
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Shared pooled session so repeated mirror hits reuse TCP+TLS connections
+_session = build_session()
+
+
+@lru_cache(maxsize=8)
+def _scihub_for(mirrors: tuple, headers: frozenset) -> SciHubDownloader:
+    # One downloader per mirror list and headers, so mirror latency probes and
+    # health scores carry over from one DOI to the next
+    return SciHubDownloader(
+        headers=dict(headers),
+        download_dir=Path("scihub_downloads"),
+        mirrors=list(mirrors),
+        session=_session,
+    )
+
 # %%
 
 def download_pdf_from_doi(doi: str, mirrors: list, headers: dict) -> tuple[str, str]:
     """
-    Tries to download a PDF for a given DOI from a list of Sci-Hub mirrors.
-    It shuffles the mirrors and tries them one by one until it succeeds.
+    Tries to download a PDF for a given DOI from a list of Sci-Hub mirrors into
+    'scihub_downloads'. Thin wrapper around SciHubDownloader so there is a single
+    Sci-Hub implementation; the downloader is reused across calls with the same
+    mirrors and headers.
     Returns a tuple of (doi, status) where status is 'success' or 'fail'.
     """
-    shuffled_mirrors = mirrors.copy()
-    random.shuffle(shuffled_mirrors)
-    
-    for mirror in shuffled_mirrors:
-        try:
-            scihub_url = mirror + doi
-            logging.info(f"Trying mirror: {mirror} for DOI: {doi}")
-            response = requests.get(scihub_url, headers=headers, timeout=15)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'lxml')
-                embed_tag = soup.find('embed', id='pdf')
-                
-                if embed_tag and embed_tag.get('src'):
-                    pdf_url = embed_tag.get('src')
-                    
-                    if pdf_url.startswith('//'):
-                        pdf_url = 'https:' + pdf_url
-                    elif not pdf_url.startswith('http'):
-                        pdf_url = urljoin(response.url, pdf_url)
-
-                    logging.info(f"Found PDF URL: {pdf_url}")
-                    pdf_response = requests.get(pdf_url, headers=headers, timeout=30)
-
-                    if pdf_response.status_code == 200 and pdf_response.content:
-                        download_path = Path("scihub_downloads")
-                        download_path.mkdir(parents=True, exist_ok=True)
-                        file_path = download_path / (_sanitize_doi(doi) + ".pdf")
-                        file_path.write_bytes(pdf_response.content)
-                        logging.info(f"Successfully saved PDF to {file_path}")
-                        return doi, "success"
-                    else:
-                        logging.warning(f"Failed to download PDF from {pdf_url}. Status: {pdf_response.status_code}")
-                else:
-                    logging.warning("Could not find embed tag with PDF source on the page.")
-            else:
-                logging.warning(f"Failed to get a 200 response from {scihub_url}. Status: {response.status_code}")
-
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Request failed for mirror {mirror}: {e}")
-            continue # Try next mirror
-            
+    scihub = _scihub_for(tuple(mirrors), frozenset(headers.items()))
+    file_path = scihub.try_download(doi)
+    if file_path:
+        logging.info(f"Successfully saved PDF to {file_path}")
+        return doi, "success"
+
     logging.error(f"All mirrors failed for DOI: {doi}")
     return doi, "fail"
 
@@ -85,7 +60,8 @@ def run_bulk_download(
     download_dir: str | Path = "fulldownloads",
     headers: dict | None = None,
     mirrors: list[str] | None = None,
-) -> pd.DataFrame:
+    max_workers: int = 8,
+) -> "pd.DataFrame":
     """High-level helper wrapping the plugin-based PDFDownloadManager.
 
     Keeps notebook usage minimal by:
@@ -104,12 +80,16 @@ def run_bulk_download(
         Optional override for HTTP headers (defaults to utility.headers).
     mirrors : list[str] | None
         Optional override for Sci-Hub mirrors (defaults to utility.scihub_mirrors).
+    max_workers : int
+        Number of DOIs downloaded concurrently.
 
     Returns
     -------
     pd.DataFrame
         DataFrame with columns: doi, success (bool).
     """
+    import pandas as pd  # deferred: heavy import only needed for the returned frame
+
     if isinstance(dois, str):
         dois_list = [dois]
     else:
@@ -119,15 +99,19 @@ def run_bulk_download(
     mirrors = mirrors or _global_mirrors
     download_path = Path(download_dir)
 
+    session = build_session()
     strategies = [
-        UnpaywallDownloader(headers=headers, download_dir=download_path),
-        CrossrefDownloader(headers=headers, download_dir=download_path),
-        SciHubDownloader(headers=headers, download_dir=download_path, mirrors=mirrors),
+        UnpaywallDownloader(headers=headers, download_dir=download_path, session=session),
+        CrossrefDownloader(headers=headers, download_dir=download_path, session=session),
+        SciHubDownloader(headers=headers, download_dir=download_path, mirrors=mirrors, session=session),
     ]
-    manager = PDFDownloadManager(strategies=strategies, download_dir=download_path)
-    manager.download(dois_list)
+    manager = PDFDownloadManager(strategies=strategies, download_dir=download_path, cache=PDFCache(), session=session, max_workers=max_workers)
+    try:
+        manager.download(dois_list)
+    finally:
+        manager.close()
     manager.save_results_to_csv()
-    return pd.DataFrame(manager.results)
+    return pd.DataFrame(manager.result_columns())
 
 
 def zip_downloads(download_dir: str | Path = "fulldownloads", zip_name: str = "papers_zip") -> Path:
@@ -145,7 +129,7 @@ def zip_downloads(download_dir: str | Path = "fulldownloads", zip_name: str = "p
     Path
         Path to the created zip file.
     """
-    from zipfile import ZipFile
+    from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
     download_path = Path(download_dir)
     if not download_path.exists():
@@ -153,18 +137,23 @@ def zip_downloads(download_dir: str | Path = "fulldownloads", zip_name: str = "p
 
     zip_path = download_path.parent / f"{zip_name}.zip"
     with ZipFile(zip_path, "w") as zf:
-        for pdf in download_path.glob("*.pdf"):
-            zf.write(pdf, pdf.name)
+        # PDFs are already compressed internally; deflating them again only costs CPU
+        with os.scandir(download_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".pdf") and entry.is_file():
+                    zf.write(entry.path, entry.name, compress_type=ZIP_STORED)
 
         # include summary CSV if present
         summary_csv = download_path / "download_summary.csv"
         if summary_csv.exists():
-            zf.write(summary_csv, summary_csv.name)
+            zf.write(summary_csv, summary_csv.name, compress_type=ZIP_DEFLATED)
 
     logging.info(f"Created zip archive at {zip_path}")
     return zip_path
 
 if __name__ == '__main__':
+    import pandas as pd
+
     # List of Sci-Hub mirrors
     scihub_mirrors = [
         "https://sci-hub.se/",
@@ -1,18 +1,483 @@
 from __future__ import annotations
 
+import csv
+import html
+import itertools
+import json
 import logging
-import random
+import multiprocessing
+import os
 import re
+import shutil
+import sqlite3
+import threading
+import time
 
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from datetime import date
 from pathlib import Path
-from typing import Optional, Iterable, Tuple
-from urllib.parse import urljoin
-from utility import headers, generate_random_email, _sanitize_doi, scihub_mirrors
+from typing import Optional, Iterable, Iterator, Tuple
+from urllib.parse import quote, urljoin, urlparse
+from utility import headers, api_headers, polite_email, daily_email, generate_random_email, _sanitize_doi, _DOI_RE, scihub_mirrors
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
+from lxml import etree, html as lxml_html
 
+try:
+    import orjson  # optional: several times faster than json on Crossref's large payloads
+except ImportError:
+    orjson = None
+
+# Refuse PDFs larger than this before consuming the body
+MAX_PDF_BYTES = 200 * 1024 * 1024
+# Bodies smaller than this are error/landing pages rather than papers
+MIN_PDF_BYTES = 10_000
+# An existing file at least this large counts as already downloaded
+EXISTING_PDF_MIN_BYTES = 4096
+# HTML pages larger than this are not parsed (landing pages are far smaller)
+MAX_HTML_BYTES = 5 * 1024 * 1024
+# Crawled pages larger than this are scanned for PDF links in a worker process,
+# so parsing them doesn't hold the GIL the download threads need
+OFFLOAD_PARSE_BYTES = 200_000
+# Crawled pages smaller than this are scanned with _PDF_HREF_RE instead of being parsed
+REGEX_SCAN_BYTES = 51_200
+PARSE_PROCESSES = 4
+# Per-run summary written by PDFDownloadManager
+SUMMARY_FILENAME = "download_summary.csv"
+SUMMARY_FIELDS = ("doi", "success")
+# Default location of the PDF cache shared between runs
+CACHE_DIR = Path.home() / ".paper_hunter_cache"
+# Requests per second allowed to each host; anything unlisted (Sci-Hub mirrors,
+# publisher sites) gets DEFAULT_HOST_RATE
+HOST_RATE_LIMITS = {
+    "api.crossref.org": 50.0,
+    "api.unpaywall.org": 10.0,
+}
+DEFAULT_HOST_RATE = 2.0
+# Requests allowed in flight to a single host at once, across all strategies and threads
+MAX_REQUESTS_PER_HOST = 5
+# Upper bound on a server-requested Retry-After wait, in seconds
+MAX_RETRY_AFTER = 60.0
+# Statuses retried by the session's transport (see build_session), honouring Retry-After
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+# A failing Sci-Hub mirror is skipped for MIRROR_BACKOFF * 2**consecutive_fails
+# seconds, capped at MAX_MIRROR_BACKOFF
+MIRROR_BACKOFF = 60.0
+MAX_MIRROR_BACKOFF = 3600.0
+# Mirror latency is probed on first use and again after MIRROR_REPROBE_INTERVAL seconds
+MIRROR_PROBE_TRIALS = 3
+MIRROR_PROBE_TIMEOUT = 3.0
+MIRROR_REPROBE_INTERVAL = 3600.0
+# Sci-Hub mirrors queried concurrently per DOI (best-ranked first)
+MIRROR_RACE_WIDTH = 3
+# URL endings treated as direct PDF links (checked against the lower-cased URL)
+_PDF_SUFFIXES = (".pdf", ".pdf?download=true")
+
+# Seconds a Crossref/Unpaywall metadata lookup is reused before being fetched again;
+# older entries are still used as a fallback while the API is unreachable
+METADATA_TTL = 30 * 24 * 3600
+# SQLite file persisting metadata lookups between processes (kept outside CACHE_DIR,
+# which PDFCache.clear removes)
+METADATA_DB = Path.home() / ".paper_hunter_metadata.sqlite3"
+# Lookups kept in memory in front of METADATA_DB
+METADATA_MEMORY_ENTRIES = 10_000
+# Hosts that refused a request (auth, rate limit, server error) are not crawled
+# again for BLOCKED_HOST_TTL seconds, by any DOI
+BLOCKED_HOST_TTL = 300.0
+BLOCKED_STATUSES = frozenset({401, 403, 429, 500, 502, 503, 504})
+
+
+def _parse_json(resp: requests.Response):
+    """Decode a JSON response body with orjson when installed, else the stdlib json module."""
+    if not resp.content:
+        return {}
+    return orjson.loads(resp.content) if orjson is not None else json.loads(resp.content)
+
+
+def _parse_html(content: bytes) -> Optional[lxml_html.HtmlElement]:
+    """
+    Parse an HTML page with lxml's C parser; returns None for empty, oversized
+    (see MAX_HTML_BYTES) or unparsable pages.
+    """
+    if len(content) > MAX_HTML_BYTES:
+        logging.warning(f"Not parsing {len(content)}-byte HTML page (limit {MAX_HTML_BYTES})")
+        return None
+    try:
+        return lxml_html.fromstring(content)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+class _PdfHrefTarget:
+    """
+    lxml parser target that collects PDF hrefs from <a> tags as the parser streams
+    past them, without building a tree (lxml's counterpart of a bs4 SoupStrainer).
+    lxml skips the callbacks a target doesn't define, so text and end tags cost nothing.
+    """
+
+    def __init__(self):
+        self.hrefs: list[str] = []
+
+    def start(self, tag, attrib):
+        if tag == "a":
+            href = attrib.get("href")
+            if href and href.lower().endswith(_PDF_SUFFIXES):
+                self.hrefs.append(href)
+
+    def close(self) -> list[str]:
+        return self.hrefs
+
+
+def _extract_pdf_hrefs(content: bytes) -> list[str]:
+    """Return the hrefs of a page's anchors that point at PDFs (see _PDF_SUFFIXES)."""
+    if not content or len(content) > MAX_HTML_BYTES:
+        return []
+    # A fresh parser per call: the target holds state and lxml parsers aren't thread-safe
+    parser = etree.HTMLParser(target=_PdfHrefTarget())
+    try:
+        return etree.fromstring(content, parser)
+    except (etree.ParserError, etree.XMLSyntaxError, ValueError):
+        return []
+
+
+# href values of <a> tags, double-, single- or un-quoted, for the small-page fast path;
+# filtered by _PDF_SUFFIXES like _PdfHrefTarget so both paths return the same links
+_PDF_HREF_RE = re.compile(
+    rb'<a\b[^>]*?\shref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>"\']+))',
+    re.IGNORECASE,
+)
+
+
+def _regex_pdf_hrefs(content: bytes) -> list[str]:
+    hrefs = []
+    for m in _PDF_HREF_RE.finditer(content):
+        href = html.unescape((m.group(1) or m.group(2) or m.group(3) or b"").decode("utf-8", "ignore"))
+        if href.lower().endswith(_PDF_SUFFIXES):
+            hrefs.append(href)
+    return hrefs
+
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def _pdf_hrefs(content: bytes) -> list[str]:
+    """
+    PDF hrefs on a crawled page: a bytes regex for pages under REGEX_SCAN_BYTES,
+    _extract_pdf_hrefs inline up to OFFLOAD_PARSE_BYTES, and in the shared process
+    pool above that.
+    """
+    global _parse_pool
+    if len(content) < REGEX_SCAN_BYTES:
+        return _regex_pdf_hrefs(content)
+    if len(content) <= OFFLOAD_PARSE_BYTES:
+        return _extract_pdf_hrefs(content)
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # spawn, not fork: forking a process full of download threads can deadlock the child
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+            )
+        pool = _parse_pool
+    try:
+        return pool.submit(_extract_pdf_hrefs, content).result()
+    except (BrokenProcessPool, OSError) as e:
+        logging.warning(f"Parse worker failed ({e}); parsing in-process")
+        return _extract_pdf_hrefs(content)
+
+
+class _RateLimiter:
+    """Thread-safe token bucket allowing `rate` requests per second, with bursts up to `rate`."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Reserve a token even if it drives the balance negative; later callers queue behind it
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+    def update_from_headers(self, headers) -> None:
+        """
+        Follow the limits a server advertises: Crossref's X-Rate-Limit-Limit per
+        X-Rate-Limit-Interval sets the rate, and an exhausted X-RateLimit-Remaining
+        holds every caller back until X-RateLimit-Reset.
+        """
+        limit = headers.get("X-Rate-Limit-Limit")
+        if limit:
+            try:
+                interval = float(headers.get("X-Rate-Limit-Interval", "1s").rstrip("s") or 1)
+                rate = float(limit) / interval
+            except (ValueError, ZeroDivisionError):
+                rate = None
+            if rate and rate > 0 and rate != self.rate:
+                with self._lock:
+                    self.rate = rate
+                    self._tokens = min(self._tokens, rate)
+
+        if headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                reset = float(headers.get("X-RateLimit-Reset", 1))
+            except ValueError:
+                reset = 1.0
+            # Reset is either seconds to wait or an epoch timestamp
+            if reset > 1e9:
+                reset -= time.time()
+            reset = min(max(reset, 0.0), MAX_RETRY_AFTER)
+            with self._lock:
+                self._tokens = min(self._tokens, -reset * self.rate)
+
+
+_limiters: dict[str, _RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _limiter_for(host: str) -> _RateLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = _RateLimiter(HOST_RATE_LIMITS.get(host, DEFAULT_HOST_RATE))
+        return limiter
+
+
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+
+
+@contextmanager
+def _host_slot(url: str):
+    """Hold one of the MAX_REQUESTS_PER_HOST slots for url's host while a request (and its body read) runs."""
+    host = urlparse(url).netloc
+    with _limiters_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+    with slot:
+        yield
+
+
+class _TTLCache:
+    """
+    Thread-safe in-process dict whose entries expire ttl seconds after being stored,
+    holding at most maxsize entries. Entries are kept in the order they were stored,
+    which with a single ttl is also expiry order, so put() drops expired entries and
+    then the oldest ones from the front.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 10_000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if time.monotonic() >= expires:
+                del self._data[key]
+                return None
+            return value
+
+    def put(self, key, value) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            while self._data:
+                expires, _ = next(iter(self._data.values()))
+                if expires > now and len(self._data) <= self.maxsize:
+                    break
+                self._data.popitem(last=False)
+
+
+class _MetadataCache:
+    """
+    API metadata keyed by (source, lower-cased DOI): an in-process TTL cache in front
+    of a SQLite file, so repeat DOIs skip the API across runs and processes. If the
+    database can't be opened the cache silently stays in memory only.
+    """
+
+    def __init__(self, db_path: Path, ttl: float):
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self._memory = _TTLCache(ttl, METADATA_MEMORY_ENTRIES)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        # Caller holds self._lock
+        if self._conn is None and not self._disabled:
+            try:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored REAL NOT NULL)"
+                )
+                # Full Unpaywall records from before only the PDF URL was kept
+                with self._conn:
+                    self._conn.execute("DELETE FROM metadata WHERE key >= 'unpaywall:' AND key < 'unpaywall;'")
+            except sqlite3.Error as e:
+                logging.warning(f"Metadata cache at {self.db_path} unavailable ({e}); caching in memory only")
+                self._disabled = True
+                self._conn = None
+        return self._conn
+
+    def _load(self, key, max_age: Optional[float]):
+        with self._lock:
+            db = self._db()
+            if db is None:
+                return None
+            try:
+                row = db.execute("SELECT value, stored FROM metadata WHERE key = ?", (":".join(key),)).fetchone()
+            except sqlite3.Error as e:
+                logging.warning(f"Metadata cache read failed: {e}")
+                return None
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        return json.loads(row[0])
+
+    def get(self, key):
+        """Fresh (younger than ttl) value for key, or None."""
+        value = self._memory.get(key)
+        if value is None:
+            value = self._load(key, self.ttl)
+            if value is not None:
+                self._memory.put(key, value)
+        return value
+
+    def get_stale(self, key):
+        """Last stored value for key whatever its age, for when the API can't be reached."""
+        value = self._memory.get(key)
+        return value if value is not None else self._load(key, None)
+
+    def put(self, key, value) -> None:
+        self._memory.put(key, value)
+        with self._lock:
+            db = self._db()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO metadata (key, value, stored) VALUES (?, ?, ?)",
+                        (":".join(key), json.dumps(value), time.time()),
+                    )
+            except sqlite3.Error as e:
+                logging.warning(f"Metadata cache write failed: {e}")
+
+
+# Module level so every strategy instance (and every run in a long-lived process
+# such as the Streamlit app) shares it
+_metadata_cache = _MetadataCache(METADATA_DB, METADATA_TTL)
+
+# netloc -> status of the refusal, see BLOCKED_STATUSES
+_blocked_hosts = _TTLCache(BLOCKED_HOST_TTL)
+
+
+def _note_status(url: str, status: int) -> None:
+    if status in BLOCKED_STATUSES:
+        _blocked_hosts.put(urlparse(url).netloc, status)
+
+
+def _host_blocked(url: str) -> bool:
+    return _blocked_hosts.get(urlparse(url).netloc) is not None
+
+
+# GETs currently in flight, keyed by (url, headers). A thread asking for a URL that
+# another thread is already fetching waits for that result instead of refetching.
+_inflight: dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _content_length(r: requests.Response) -> int:
+    # 0 when missing or unparsable (e.g. a repeated "20009, 20009" header); the
+    # streamed byte count still enforces MAX_PDF_BYTES
+    try:
+        return int(r.headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
+
+
+def _thread_prefix(name: str) -> str:
+    # Worker threads are named after the thread that started them, so log records
+    # can be traced back to the run they belong to (app.py routes them per run)
+    return f"{threading.current_thread().name}-{name}"
+
+
+class _CappedRetry(Retry):
+    """Retry that never waits longer than MAX_RETRY_AFTER, whatever Retry-After asks for."""
+
+    def parse_retry_after(self, retry_after: str) -> float:
+        return min(super().parse_retry_after(retry_after), MAX_RETRY_AFTER)
+
+
+# urllib3 logs every retry at WARNING; only the final failure is worth reporting,
+# and PDFDownloader._fetch and the strategies already log that
+logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+
+# backoff_jitter was added in urllib3 2.0
+_RETRY_JITTER = {"backoff_jitter": 0.25} if int(urllib3.__version__.split(".")[0]) >= 2 else {}
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that throttles every request with a per-host token bucket (shared
+    across sessions and threads), tuned by the server's rate-limit headers.
+    """
+
+    def send(self, request, **kwargs):
+        limiter = _limiter_for(urlparse(request.url).netloc)
+        limiter.acquire()
+        response = super().send(request, **kwargs)
+        limiter.update_from_headers(response.headers)
+        return response
+
+
+def build_session(pool_size: int = 32, pool_maxsize: int = 64) -> requests.Session:
+    """
+    Create a requests.Session with a pooled HTTPAdapter so TCP+TLS connections are
+    reused across DOIs. Connection errors, read errors and RETRY_STATUSES responses
+    are retried by urllib3 with jittered exponential backoff, or after the server's
+    Retry-After; the last response is returned once retries run out.
+    Requests are rate limited per host (see HOST_RATE_LIMITS).
+    """
+    session = requests.Session()
+    adapter = _RateLimitedAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_maxsize,
+        max_retries=_CappedRetry(
+            total=5,
+            connect=3,
+            read=3,
+            status=3,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            **_RETRY_JITTER,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 # --- base class with shared helpers (DRY) ---
@@ -21,19 +486,149 @@ class PDFDownloader:
     headers: dict
     download_dir: Path
     timeout: int = 15
+    # Pass one session to every strategy of a run so they share the connection pool
+    session: Optional[requests.Session] = None
+
+    def __post_init__(self):
+        if self.session is None:
+            self.session = build_session()
+        # Create the output directory once here rather than on every save
+        self.download_dir = Path(self.download_dir)
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self._pdf_headers = {**self.headers, "Accept": "application/pdf, */*"}
+
+    def _get(self, url: str, timeout: Optional[int] = None, headers: Optional[dict] = None) -> Optional[requests.Response]:
+        """
+        GET url; transient failures are retried by the session's transport (see
+        build_session). headers overrides the strategy's headers (e.g. api_headers).
+        Concurrent calls for the same URL and headers share one request.
+        Returns the response, or None if the request raised.
+        """
+        headers = headers or self.headers
+        key = (url, frozenset(headers.items()))
+        with _inflight_lock:
+            fut = _inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = _inflight[key] = Future()
+        if not owner:
+            return fut.result()
+        try:
+            resp = self._fetch(url, timeout, headers)
+            fut.set_result(resp)
+            return resp
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
 
-    def _get(self, url: str, timeout: Optional[int] = None) -> Optional[requests.Response]:
+    def _fetch(self, url: str, timeout: Optional[int], headers: dict) -> Optional[requests.Response]:
         try:
-            return requests.get(url, headers=self.headers, timeout=timeout or self.timeout)
+            with _host_slot(url):
+                return self.session.get(url, headers=headers, timeout=timeout or self.timeout)
         except requests.RequestException as e:
             logging.warning(f"GET failed: {url} ({e})")
             return None
 
-    def _save_pdf(self, doi: str, content: bytes) -> Path:
-        self.download_dir.mkdir(parents=True, exist_ok=True)
+    def _looks_like_pdf(self, url: str) -> bool:
+        """
+        Cheap probe before a full download: HEAD the URL and check Content-Type (PDF or
+        octet-stream) and Content-Length (between MIN_PDF_BYTES and MAX_PDF_BYTES).
+        Any other HEAD failure except 404/410 is inconclusive (servers such as S3
+        presigned URLs and some CDNs refuse HEAD with 403 but serve the GET), so a
+        4-byte ranged GET is made instead and checked for the %PDF magic number.
+        """
+        try:
+            with _host_slot(url):
+                r = self.session.head(url, headers=self._pdf_headers, allow_redirects=True, timeout=5)
+                if r.status_code in (404, 410):
+                    return False
+                if not 200 <= r.status_code < 300:
+                    range_headers = {**self._pdf_headers, "Range": "bytes=0-3"}
+                    with self.session.get(url, headers=range_headers, timeout=5, stream=True) as g:
+                        _note_status(url, g.status_code)
+                        return g.status_code in (200, 206) and next(g.iter_content(4), b"").startswith(b"%PDF")
+        except requests.RequestException:
+            # Inconclusive; let the real download decide
+            return True
+
+        content_type = r.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        length = _content_length(r)
+        # Some servers label PDFs as generic binary; the %PDF check after GET catches impostors
+        if "pdf" not in content_type and content_type != "application/octet-stream":
+            return False
+        if length > MAX_PDF_BYTES:
+            logging.info(f"Skipping {url}: {length} bytes exceeds limit")
+            return False
+        # A missing Content-Length (chunked transfer) is not evidence against a PDF
+        return not length or length >= MIN_PDF_BYTES
+
+    def _download_pdf(self, doi: str, url: str, timeout: int = 30) -> Optional[Path]:
+        """Probe url, then stream the PDF it serves to disk (see _save_pdf_stream)."""
+        if not self._looks_like_pdf(url):
+            logging.info(f"Skipping {url}: HEAD probe says it is not a PDF")
+            return None
+
+        try:
+            with _host_slot(url), self.session.get(url, headers=self._pdf_headers, timeout=timeout, stream=True) as r:
+                if r.status_code != 200:
+                    _note_status(url, r.status_code)
+                    logging.warning(f"Failed to download PDF from {url}. Status: {r.status_code}")
+                    return None
+                return self._save_pdf_stream(doi, r)
+        except requests.RequestException as e:
+            logging.warning(f"Failed to download PDF from {url} ({e})")
+            return None
+
+    def _save_pdf_stream(self, doi: str, r: requests.Response) -> Optional[Path]:
+        """
+        Write a streamed (stream=True) PDF response to disk in 64 KB chunks so memory
+        stays flat regardless of file size. Oversized bodies and non-PDF content are
+        rejected: only the 4-byte magic number is read before the %PDF check, so an
+        HTML error or CAPTCHA page costs 4 bytes rather than its whole body, and any
+        partial file is removed.
+        """
+        url = r.url
+        length = _content_length(r)
+        if length > MAX_PDF_BYTES:
+            logging.warning(f"Skipping PDF at {url}: {length} bytes exceeds limit")
+            return None
+
         path = self.download_dir / f"{_sanitize_doi(doi)}.pdf"
-        path.write_bytes(content)
-        return path
+        # Written under a temporary name and renamed when complete, so an interrupted
+        # download never leaves a truncated .pdf that a later run would skip as done
+        part = path.with_name(f"{path.name}.{threading.get_ident()}.part")
+        try:
+            # Read the raw stream into one preallocated buffer per download instead
+            # of allocating a new bytes object for every chunk
+            raw = r.raw
+            raw.decode_content = True
+            magic = raw.read(4)
+            if magic != b"%PDF":
+                logging.warning(f"Content at {url} doesn't appear to be a valid PDF")
+                return None
+
+            buf = bytearray(1 << 16)
+            view = memoryview(buf)
+            written = len(magic)
+            with open(part, "wb", buffering=0) as f:
+                f.write(magic)
+                while True:
+                    n = raw.readinto(buf)
+                    if not n:
+                        break
+                    written += n
+                    if written > MAX_PDF_BYTES:
+                        raise ValueError(f"PDF exceeds {MAX_PDF_BYTES} bytes")
+                    f.write(view[:n])
+            os.replace(part, path)
+            return path
+        except (requests.RequestException, urllib3.exceptions.HTTPError, OSError, ValueError) as e:
+            logging.warning(f"Failed to download PDF from {url} ({e})")
+            part.unlink(missing_ok=True)
+            return None
 
     def try_download(self, doi: str, **kwargs) -> Optional[Path]:
         # Accept extra kwargs to allow passing optional params (e.g., email) to specific strategies.
@@ -48,40 +643,102 @@ class UnpaywallDownloader(PDFDownloader):
         # Email is provided by the caller (PDFDownloadManager). Fall back to random generation if needed.
         if not email:
             email = generate_random_email()
-        api_url = f"{self.api}{doi}?email={email}"
-        logging.info(f"Unpaywall: querying API at {api_url}")
-        resp = self._get(api_url)
-        if not resp or resp.status_code != 200:
-            status = resp.status_code if resp else "N/A"
-            logging.warning(f"Unpaywall API request failed. Status: {status}")
-            return None
+        # Only best_oa_location.url_for_pdf is cached ("" when there is none), not the whole record
+        key = ("unpaywall_pdf", doi.lower())
+        pdf_url = _metadata_cache.get(key)
+        if pdf_url is None:
+            api_url = f"{self.api}{doi}?email={email}"
+            logging.info(f"Unpaywall: querying API at {api_url}")
+            resp = self._get(api_url, headers=api_headers)
+            if resp is not None and resp.status_code == 200:
+                loc = (_parse_json(resp) or {}).get("best_oa_location") or {}
+                pdf_url = loc.get("url_for_pdf") or ""
+                _metadata_cache.put(key, pdf_url)
+            else:
+                status = resp.status_code if resp else "N/A"
+                logging.warning(f"Unpaywall API request failed. Status: {status}")
+                pdf_url = _metadata_cache.get_stale(key)
+                if pdf_url is None:
+                    return None
+                logging.info("Unpaywall: using expired cached metadata")
 
-        data = resp.json() or {}
-        loc = data.get("best_oa_location") or {}
-        pdf_url = loc.get("url_for_pdf")
         if not pdf_url:
             logging.info("Unpaywall: No direct OA PDF URL found.")
             return None
 
-        pdf = self._get(pdf_url, timeout=30)
-        if pdf and pdf.status_code == 200 and pdf.content:
-            return self._save_pdf(doi, pdf.content)
-        return None
+        return self._download_pdf(doi, pdf_url)
 
 
 # --- Crossref strategy ---
 class CrossrefDownloader(PDFDownloader):
     api = "https://api.crossref.org/works/"
+    # DOIs per /works?filter=doi:... request in prefetch()
+    batch_size = 40
+
+    @staticmethod
+    def _mailto(sep: str) -> str:
+        # Crossref also reads the polite-pool contact from a mailto query parameter
+        return f"{sep}mailto={polite_email}" if polite_email else ""
+
+    @staticmethod
+    def _slim_links(links: Optional[list]) -> list[dict]:
+        # Keep only the link fields try_download reads, so cached entries stay small
+        return [
+            {k: link[k] for k in ("URL", "content-type", "intended-application") if k in link}
+            for link in links or ()
+        ]
+
+    def prefetch(self, dois: Iterable[str]) -> dict[str, list]:
+        """
+        Fetch link metadata for many DOIs with batched /works?filter=doi:... queries,
+        so try_download can skip the per-DOI API round-trip on a cache hit.
+        Link lists are stored in the shared metadata cache; the ones fetched by this
+        call are also returned, keyed by lower-cased DOI.
+        """
+        # Commas separate filter values, so DOIs containing one are looked up individually
+        pending = [
+            d for d in dict.fromkeys(dois)
+            if "," not in d and _metadata_cache.get(("crossref", d.lower())) is None
+        ]
+        fetched: dict[str, list] = {}
+        for i in range(0, len(pending), self.batch_size):
+            chunk = pending[i:i + self.batch_size]
+            # Percent-encode each DOI: SICI DOIs can contain '#' or '&', which would
+            # otherwise cut the query short
+            query = ",".join(f"doi:{quote(d, safe='/:;()')}" for d in chunk)
+            # select= trims each item to the two fields we use instead of the full record
+            resp = self._get(f"{self.api.rstrip('/')}?filter={query}&rows={len(chunk)}&select=DOI,link{self._mailto('&')}", headers=api_headers)
+            if not resp or resp.status_code != 200:
+                status = resp.status_code if resp else "N/A"
+                logging.warning(f"Crossref batch lookup failed. Status: {status}")
+                continue
+            items = (_parse_json(resp).get("message") or {}).get("items", []) or []
+            for item in items:
+                if item.get("DOI"):
+                    key = item["DOI"].lower()
+                    fetched[key] = self._slim_links(item.get("link"))
+                    _metadata_cache.put(("crossref", key), fetched[key])
+        logging.info(f"Crossref: prefetched metadata for {len(fetched)} DOI(s)")
+        return fetched
 
     def try_download(self, doi: str) -> Optional[Path]:
-        logging.info(f"Crossref: querying API for {doi}")
-        resp = self._get(f"{self.api}{doi}")
-        if not resp or resp.status_code != 200:
-            status = resp.status_code if resp else "N/A"
-            logging.warning(f"Crossref API request failed. Status: {status}")
-            return None
+        links = _metadata_cache.get(("crossref", doi.lower()))
+        if links is None:
+            logging.info(f"Crossref: querying API for {doi}")
+            resp = self._get(f"{self.api}{quote(doi, safe='/:;()')}{self._mailto('?')}", headers=api_headers)
+            if resp is not None and resp.status_code == 200:
+                links = self._slim_links((_parse_json(resp).get("message") or {}).get("link"))
+                _metadata_cache.put(("crossref", doi.lower()), links)
+            else:
+                status = resp.status_code if resp else "N/A"
+                logging.warning(f"Crossref API request failed. Status: {status}")
+                links = _metadata_cache.get_stale(("crossref", doi.lower()))
+                if links is None:
+                    return None
+                logging.info("Crossref: using expired cached metadata")
 
-        links = (resp.json().get("message") or {}).get("link", []) or []
+        # PDF URLs already attempted for this DOI, so later steps don't refetch them
+        tried_pdfs: set[str] = set()
 
         # 1) direct PDF links (from metadata or URL)
         for link in links:
@@ -90,7 +747,8 @@ class CrossrefDownloader(PDFDownloader):
                 continue
             
             # Check for explicit PDF content-type or if URL ends with .pdf
-            if link.get("content-type") == "application/pdf" or url.lower().endswith(".pdf"):
+            if link.get("content-type") == "application/pdf" or url.lower().endswith(_PDF_SUFFIXES):
+                tried_pdfs.add(url)
                 path = self._try_pdf(doi, url)
                 if path:
                     return path
@@ -101,134 +759,266 @@ class CrossrefDownloader(PDFDownloader):
             if url and "mdpi.com" in url and "/htm" in url:
                 # MDPI often provides a direct PDF link by replacing the /htm part with /pdf
                 pdf_url = url.replace("/htm", "/pdf")
+                if pdf_url in tried_pdfs:
+                    continue
+                tried_pdfs.add(pdf_url)
                 path = self._try_pdf(doi, pdf_url)
                 if path:
                     return path
 
         # 3) crawl linked pages for .pdf anchors
         # Prioritize pages intended for reading or text mining
-        crawl_links = [
-            link for link in links if link.get("URL") and (
+        # Add any remaining links after them; keyed by URL so each page is fetched once
+        crawl_urls = dict.fromkeys(
+            link["URL"] for link in links if link.get("URL") and (
                 link.get("content-type") == "text/html" or
                 link.get("intended-application") == "text-mining"
             )
-        ]
-        # Add any remaining links that haven't been tried
-        for link in links:
-            if link not in crawl_links and link.get("URL"):
-                crawl_links.append(link)
+        )
+        crawl_urls.update(dict.fromkeys(link["URL"] for link in links if link.get("URL")))
 
-        for link in crawl_links:
-            page_url = link.get("URL")
-            if not page_url:
-                continue
-            
+        for page_url in crawl_urls:
             # Avoid re-downloading a URL if it was already tried as a direct PDF
-            if page_url.lower().endswith(".pdf"):
+            if page_url in tried_pdfs or page_url.lower().endswith(_PDF_SUFFIXES):
+                continue
+            # Skip publishers that already refused us (e.g. 403 on the direct PDF link)
+            if _host_blocked(page_url):
+                logging.info(f"Crossref: skipping {page_url}, host recently refused requests")
                 continue
 
             page = self._get(page_url)
             if not page or page.status_code != 200:
+                if page is not None:
+                    _note_status(page_url, page.status_code)
                 continue
-            soup = BeautifulSoup(page.content, "html.parser")
-            for a in soup.select('a[href]'):
-                href = a["href"]
-                if href.lower().endswith(".pdf"):
-                    pdf_url = href if href.startswith("http") else urljoin(page_url, href)
-                    path = self._try_pdf(doi, pdf_url)
-                    if path:
-                        return path
+            for href in _pdf_hrefs(page.content):
+                pdf_url = href if href.startswith("http") else urljoin(page_url, href)
+                if pdf_url in tried_pdfs:
+                    continue
+                tried_pdfs.add(pdf_url)
+                path = self._try_pdf(doi, pdf_url)
+                if path:
+                    return path
 
         return None
 
     def _try_pdf(self, doi: str, url: str) -> Optional[Path]:
-        pdf = self._get(url, timeout=30)
-        if pdf and pdf.status_code == 200 and pdf.content:
-            return self._save_pdf(doi, pdf.content)
-        return None
+        return self._download_pdf(doi, url)
 
 
 # --- Sci-Hub strategy ---
+class _MirrorRace:
+    """
+    State shared by one group of concurrent mirror lookups for a DOI: once it is
+    finished, lookups that haven't started are skipped and open responses are closed
+    so their sockets are released instead of read to the end.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self._responses: set = set()
+        self._failed: set[str] = set()
+        self._lock = threading.Lock()
+
+    def track(self, response: requests.Response) -> None:
+        with self._lock:
+            if self.done.is_set():
+                response.close()
+            else:
+                self._responses.add(response)
+
+    def untrack(self, response: requests.Response) -> None:
+        with self._lock:
+            self._responses.discard(response)
+
+    def first_failure(self, mirror: str) -> bool:
+        """True the first time mirror fails in this race, so both DOI variants failing counts once."""
+        with self._lock:
+            if mirror in self._failed:
+                return False
+            self._failed.add(mirror)
+            return True
+
+    def finish(self) -> None:
+        with self._lock:
+            self.done.set()
+            responses, self._responses = self._responses, set()
+        for response in responses:
+            response.close()
+
+
+# location.href='...pdf' inside a Sci-Hub button's onclick
+_ONCLICK_PDF_RE = re.compile(r'location\.href\s*=\s*[\'"]([^\'"]+\.pdf[^\'"]*)[\'"]', re.IGNORECASE)
+
+
+# Sci-Hub PDF URLs anywhere in the page source (method 7), tried in order
+# Bytes patterns, matched against the raw response rather than a re-serialized tree
+_PDF_URL_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    rb'(//[^"\s]+\.pdf(?:\?[^"\s]*)?)',
+    rb'(https?://[^"\s]+\.pdf(?:\?[^"\s]*)?)',
+    rb'(/downloads/[^"\s]+)',
+    rb'(/pdf/[^"\s]+\.pdf)',
+))
+# Sci-Hub's "no such paper" pages
+_NOT_FOUND_RE = re.compile(r'article not found|not found in database|unavailable', re.IGNORECASE)
+
+
+def _looks_like_pdf_src(src_lower: str) -> bool:
+    return '.pdf' in src_lower or '/pdf/' in src_lower or '/downloads/' in src_lower
+
+
 class SciHubDownloader(PDFDownloader):
-    def __init__(self, headers: dict, download_dir: Path, mirrors: list):
-        super().__init__(headers, download_dir)
+    def __init__(self, headers: dict, download_dir: Path, mirrors: list, session: Optional[requests.Session] = None):
+        super().__init__(headers, download_dir, session=session)
         self.mirrors = mirrors
+        # Mirror health shared by all DOIs (and threads) using this strategy
+        self._mirror_scores = {m: 1.0 for m in mirrors}
+        self._mirror_fails = {m: 0 for m in mirrors}
+        self._mirror_last_fail: dict[str, float] = {}
+        self._mirror_lock = threading.Lock()
+        # Best-of-N response time per mirror; unreachable mirrors get inf
+        self._mirror_latency: dict[str, float] = {}
+        self._last_probe = 0.0
+        self._probe_lock = threading.Lock()
+
+    def _probe_latency(self, probe: requests.Session, mirror: str, deadline: float) -> float:
+        best = float("inf")
+        for _ in range(MIRROR_PROBE_TRIALS):
+            start = time.monotonic()
+            if start >= deadline:
+                break
+            try:
+                r = probe.head(mirror, headers=self.headers, timeout=min(MIRROR_PROBE_TIMEOUT, deadline - start), allow_redirects=True)
+            except requests.Timeout:
+                # A mirror that sat on a trial for the full timeout won't rank well; don't wait on it again
+                break
+            except requests.RequestException:
+                continue
+            if r.status_code < 500:
+                best = min(best, time.monotonic() - start)
+        return best
 
-    def _extract_pdf_url(self, soup: BeautifulSoup, base_url: str) -> Optional[str]:
+    def _probe_mirrors(self) -> None:
+        """
+        Measure each mirror's latency (concurrently) and mark unreachable mirrors as failed.
+        Probes bypass the shared session's retries and rate limiting, and the whole probe
+        is capped at MIRROR_PROBE_TRIALS * MIRROR_PROBE_TIMEOUT seconds, since DOI threads
+        wait for the ranking; mirrors still unanswered by then count as unreachable.
+        """
+        budget = MIRROR_PROBE_TRIALS * MIRROR_PROBE_TIMEOUT
+        deadline = time.monotonic() + budget
+        # A plain Session: its default adapter makes no retries
+        probe = requests.Session()
+        pool = ThreadPoolExecutor(max_workers=len(self.mirrors) or 1, thread_name_prefix=_thread_prefix("probe"))
+        try:
+            futures = {pool.submit(self._probe_latency, probe, m, deadline): m for m in self.mirrors}
+            wait(futures, timeout=budget)
+            latencies = {
+                m: fut.result() if fut.done() else float("inf")
+                for fut, m in futures.items()
+            }
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            probe.close()
+        with self._mirror_lock:
+            self._mirror_latency = latencies
+        for mirror, latency in latencies.items():
+            if latency == float("inf"):
+                self._record_mirror(mirror, False)
+        live = sorted((m for m in latencies if latencies[m] != float("inf")), key=latencies.get)
+        logging.info(f"Sci-Hub mirrors by latency: {', '.join(f'{m} ({latencies[m]:.2f}s)' for m in live) or 'none reachable'}")
+
+    def _ordered_mirrors(self) -> list[str]:
+        """
+        Mirrors by descending score, then ascending probed latency, leaving out those
+        still backing off after recent failures.
+        """
+        # Only one thread probes; the others wait for its ranking
+        with self._probe_lock:
+            if time.time() - self._last_probe > MIRROR_REPROBE_INTERVAL:
+                self._probe_mirrors()
+                self._last_probe = time.time()
+        now = time.time()
+        with self._mirror_lock:
+            ranked = sorted(
+                self.mirrors,
+                key=lambda m: (-self._mirror_scores.get(m, 1.0), self._mirror_latency.get(m, float("inf"))),
+            )
+            healthy = [
+                m for m in ranked
+                if now - self._mirror_last_fail.get(m, 0.0)
+                >= min(MIRROR_BACKOFF * 2 ** self._mirror_fails.get(m, 0), MAX_MIRROR_BACKOFF)
+            ]
+        # If every mirror is backing off, try them all rather than giving up
+        return healthy or ranked
+
+    def _record_mirror(self, mirror: str, ok: bool) -> None:
+        with self._mirror_lock:
+            if ok:
+                self._mirror_scores[mirror] = self._mirror_scores.get(mirror, 1.0) + 1.0
+                self._mirror_fails[mirror] = 0
+                self._mirror_last_fail.pop(mirror, None)
+            else:
+                self._mirror_scores[mirror] = self._mirror_scores.get(mirror, 1.0) * 0.5
+                self._mirror_fails[mirror] = self._mirror_fails.get(mirror, 0) + 1
+                self._mirror_last_fail[mirror] = time.time()
+
+    def _extract_pdf_url(self, tree: lxml_html.HtmlElement, base_url: str, content: Optional[bytes] = None) -> Optional[str]:
         """
         Extract PDF URL from Sci-Hub page using multiple detection methods.
         Sci-Hub's HTML structure varies, so we try several approaches.
         """
         pdf_url = None
-        
-        # Method 1: Look for embed tag with id='pdf'
-        embed_tag = soup.find('embed', id='pdf')
-        if embed_tag and embed_tag.get('src'):
-            pdf_url = embed_tag.get('src')
-            logging.info("Found PDF via embed#pdf tag")
-        
-        # Method 2: Look for any embed tag with PDF src
-        if not pdf_url:
-            for embed in soup.find_all('embed'):
-                src = embed.get('src', '')
-                if src and ('.pdf' in src.lower() or '/pdf/' in src.lower() or '/downloads/' in src.lower()):
-                    pdf_url = src
-                    logging.info("Found PDF via embed tag with PDF src")
-                    break
-        
-        # Method 3: Look for iframe with PDF src
-        if not pdf_url:
-            for iframe in soup.find_all('iframe'):
-                src = iframe.get('src', '')
-                if src and ('.pdf' in src.lower() or '/pdf/' in src.lower() or '/downloads/' in src.lower()):
-                    pdf_url = src
-                    logging.info("Found PDF via iframe tag")
-                    break
-        
-        # Method 4: Look for direct PDF link in buttons or onclick handlers
-        if not pdf_url:
-            for button in soup.find_all('button'):
-                onclick = button.get('onclick', '')
-                # Extract URL from onclick like: location.href='//sci-hub...pdf'
-                match = re.search(r'location\.href\s*=\s*[\'"]([^\'"]+\.pdf[^\'"]*)[\'"]', onclick, re.IGNORECASE)
-                if match:
-                    pdf_url = match.group(1)
-                    logging.info("Found PDF via button onclick")
-                    break
-        
-        # Method 5: Look for anchor tags with PDF href
-        if not pdf_url:
-            for a in soup.find_all('a', href=True):
-                href = a['href']
-                # Look for links that contain sci-hub domains and .pdf extension
-                if '.pdf' in href.lower() and ('sci-hub' in href.lower() or href.startswith('/') or href.startswith('//')):                    
-                    pdf_url = href
-                    logging.info("Found PDF via anchor tag")
-                    break
-        
-        # Method 6: Search in all src attributes
-        if not pdf_url:
-            for tag in soup.find_all(src=True):
-                src = tag['src']
-                if '.pdf' in src.lower() or '/downloads/' in src.lower():
-                    pdf_url = src
-                    logging.info(f"Found PDF via {tag.name} src attribute")
+
+        # Methods 1-6 share a single walk over the elements, keeping the first hit of
+        # each; the lowest-numbered method that matched wins, as if run in order
+        found: dict[int, tuple[str, str]] = {}
+        for el in tree.iter(etree.Element):
+            tag = el.tag
+            src = el.get('src')
+            src_lower = src.lower() if src else ''
+            if tag == 'embed' and src:
+                # Method 1: embed tag with id='pdf' (best possible hit, stop here)
+                if el.get('id') == 'pdf':
+                    found[1] = (src, "embed#pdf tag")
                     break
-        
+                # Method 2: any embed tag with PDF src
+                if 2 not in found and _looks_like_pdf_src(src_lower):
+                    found[2] = (src, "embed tag with PDF src")
+            elif tag == 'iframe' and src:
+                # Method 3: iframe with PDF src
+                if 3 not in found and _looks_like_pdf_src(src_lower):
+                    found[3] = (src, "iframe tag")
+            elif tag == 'button':
+                # Method 4: onclick like location.href='//sci-hub...pdf'
+                if 4 not in found:
+                    match = _ONCLICK_PDF_RE.search(el.get('onclick', ''))
+                    if match:
+                        found[4] = (match.group(1), "button onclick")
+            elif tag == 'a':
+                # Method 5: links that contain sci-hub domains and .pdf extension
+                href = el.get('href')
+                if 5 not in found and href and '.pdf' in href.lower() and (
+                    'sci-hub' in href.lower() or href.startswith('/')
+                ):
+                    found[5] = (href, "anchor tag")
+            # Method 6: any src attribute
+            if 6 not in found and src and ('.pdf' in src_lower or '/downloads/' in src_lower):
+                found[6] = (src, f"{tag} src attribute")
+
+        if found:
+            pdf_url, how = found[min(found)]
+            logging.info(f"Found PDF via {how}")
+
         # Method 7: Look for PDF URL in script tags or page content
         if not pdf_url:
-            page_text = str(soup)
+            # The raw page bytes when available; serializing the tree costs a full copy
+            page_bytes = content if content is not None else lxml_html.tostring(tree)
             # Pattern for Sci-Hub PDF URLs
-            patterns = [
-                r'(//[^"\s]+\.pdf(?:\?[^"\s]*)?)',
-                r'(https?://[^"\s]+\.pdf(?:\?[^"\s]*)?)',
-                r'(/downloads/[^"\s]+)',
-                r'(/pdf/[^"\s]+\.pdf)',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
+            for pattern in _PDF_URL_RES:
+                match = pattern.search(page_bytes)
                 if match:
-                    pdf_url = match.group(1)
+                    pdf_url = html.unescape(match.group(1).decode("utf-8", "ignore"))
                     logging.info(f"Found PDF via regex pattern in page content")
                     break
         
@@ -242,81 +1032,307 @@ class SciHubDownloader(PDFDownloader):
         
         return None
 
+    def _resolve_on_mirror(self, mirror: str, doi_variant: str, race: _MirrorRace) -> Optional[str]:
+        """
+        Fetch mirror's page for one DOI variant and return the PDF URL it points at,
+        or None. Skipped if the race is already over; its response is registered with
+        the race so a finished race can close it mid-read.
+        """
+        if race.done.is_set():
+            return None
+        scihub_url = mirror + doi_variant
+        logging.info(f"Trying mirror: {mirror} with DOI: {doi_variant}")
+
+        response = None
+        try:
+            with _host_slot(scihub_url):
+                response = self.session.get(scihub_url, headers=self.headers, timeout=20, allow_redirects=True, stream=True)
+                race.track(response)
+                response.raise_for_status()
+                # We got redirected directly to a PDF; the winner downloads it, so
+                # racing mirrors never write the same file
+                if 'application/pdf' in response.headers.get('Content-Type', '').lower():
+                    logging.info(f"Direct PDF response from {mirror}")
+                    return response.url
+                content = response.content
+        except requests.HTTPError as e:
+            logging.warning(f"Request to mirror {mirror} failed: {e}")
+            if e.response is not None and e.response.status_code >= 500 and race.first_failure(mirror):
+                self._record_mirror(mirror, ok=False)
+            return None
+        except requests.RequestException as e:
+            if not race.done.is_set():
+                # Connection errors and timeouts: the mirror is down
+                logging.warning(f"Request to mirror {mirror} failed: {e}")
+                if race.first_failure(mirror):
+                    self._record_mirror(mirror, ok=False)
+            return None
+        finally:
+            if response is not None:
+                race.untrack(response)
+                response.close()
+
+        tree = _parse_html(content)
+        if tree is None:
+            logging.warning(f"Empty or unparsable page from {mirror}")
+            return None
+
+        # Check if we got an error page (no paper found)
+        if _NOT_FOUND_RE.search(tree.text_content()):
+            logging.warning(f"Paper not found on {mirror}")
+            return None
+
+        pdf_url = self._extract_pdf_url(tree, response.url, content)
+        if pdf_url:
+            logging.info(f"Found PDF URL: {pdf_url}")
+            return pdf_url
+        logging.warning(f"Could not find PDF URL on the page from {mirror}")
+        return None
+
     def try_download(self, doi: str) -> Optional[Path]:
+        """
+        Query the best MIRROR_RACE_WIDTH mirrors concurrently, each with the raw and the
+        URL-encoded DOI (some mirrors handle them differently), and download from
+        whichever lookup resolves a PDF URL first; if that download fails, the next
+        lookup to finish is tried. Once a PDF is saved the remaining lookups are
+        closed; if the group yields no PDF, move on to the next one.
+        """
         logging.info(f"Sci-Hub: trying mirrors for {doi}")
-        shuffled_mirrors = self.mirrors.copy()
-        random.shuffle(shuffled_mirrors)
-        
+
         # URL-encode the DOI to handle special characters properly
-        from urllib.parse import quote
-        encoded_doi = quote(doi, safe='')
+        variants = (doi, quote(doi, safe=''))
 
-        for mirror in shuffled_mirrors:
-            # Try both encoded and raw DOI (some mirrors handle them differently)
-            doi_variants = [doi, encoded_doi]
-            
-            for doi_variant in doi_variants:
-                scihub_url = mirror + doi_variant
-                logging.info(f"Trying mirror: {mirror} with DOI: {doi_variant}")
-                
-                try:
-                    response = requests.get(scihub_url, headers=self.headers, timeout=20, allow_redirects=True)
-                    response.raise_for_status()
-                except requests.RequestException as e:
-                    logging.warning(f"Request to mirror {mirror} failed: {e}")
-                    continue
+        mirrors = self._ordered_mirrors()
+        for i in range(0, len(mirrors), MIRROR_RACE_WIDTH):
+            group = mirrors[i:i + MIRROR_RACE_WIDTH]
+            race = _MirrorRace()
+            pool = ThreadPoolExecutor(max_workers=len(group) * len(variants), thread_name_prefix=_thread_prefix("mirror"))
+            futures = {
+                pool.submit(self._resolve_on_mirror, m, v, race): m
+                for m in group for v in variants
+            }
+            tried: set[str] = set()
+            try:
+                for fut in as_completed(futures):
+                    pdf_url = fut.result()
+                    if not pdf_url or pdf_url in tried:
+                        continue
+                    tried.add(pdf_url)
+                    # The other lookups keep running: if this download fails, the
+                    # next one to resolve a PDF URL gets its turn
+                    path = self._download_pdf(doi, pdf_url)
+                    if path:
+                        self._record_mirror(futures[fut], ok=True)
+                        return path
+            finally:
+                race.finish()
+                pool.shutdown(wait=False, cancel_futures=True)
 
-                # Check if we got redirected directly to a PDF
-                content_type = response.headers.get('Content-Type', '').lower()
-                if 'application/pdf' in content_type:
-                    logging.info(f"Direct PDF response from {mirror}")
-                    if response.content and len(response.content) > 1000:  # Sanity check for valid PDF
-                        return self._save_pdf(doi, response.content)
-
-                soup = BeautifulSoup(response.content, 'lxml')
-                
-                # Check if we got an error page (no paper found)
-                error_indicators = soup.find_all(string=re.compile(r'article not found|not found in database|unavailable', re.IGNORECASE))
-                if error_indicators:
-                    logging.warning(f"Paper not found on {mirror}")
-                    continue
-                
-                pdf_url = self._extract_pdf_url(soup, response.url)
-                
-                if pdf_url:
-                    logging.info(f"Found PDF URL: {pdf_url}")
-                    
-                    try:
-                        pdf = requests.get(pdf_url, headers=self.headers, timeout=30, allow_redirects=True)
-                        
-                        if pdf and pdf.status_code == 200 and pdf.content:
-                            # Verify it's actually a PDF (check magic bytes)
-                            if pdf.content[:4] == b'%PDF' or len(pdf.content) > 10000:
-                                return self._save_pdf(doi, pdf.content)
-                            else:
-                                logging.warning(f"Downloaded content doesn't appear to be a valid PDF")
-                        else:
-                            status = pdf.status_code if pdf else "N/A"
-                            logging.warning(f"Failed to download PDF from {pdf_url}. Status: {status}")
-                    except requests.RequestException as e:
-                        logging.warning(f"Failed to download PDF: {e}")
-                else:
-                    logging.warning(f"Could not find PDF URL on the page from {mirror}")
-        
         return None
 
 
+# --- persistent PDF cache shared between runs ---
+class PDFCache:
+    """
+    Directory of previously downloaded PDFs keyed by sanitized DOI, so re-running
+    overlapping DOI lists copies files from local disk instead of the network.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, doi: str) -> Path:
+        return self.cache_dir / f"{_sanitize_doi(doi)}.pdf"
+
+    def get(self, doi: str, dest: Path) -> Optional[Path]:
+        """Copy the cached PDF for doi to dest; returns dest on a hit, None on a miss."""
+        cached = self._path(doi)
+        if not cached.is_file():
+            return None
+        # Copied under a temporary name and renamed, like a download, so an interrupted
+        # copy never leaves a truncated .pdf that would count as already downloaded
+        part = dest.with_name(f"{dest.name}.{threading.get_ident()}.part")
+        try:
+            shutil.copyfile(cached, part)
+            os.replace(part, dest)
+        except OSError as e:
+            logging.warning(f"Cache read failed for {doi}: {e}")
+            part.unlink(missing_ok=True)
+            return None
+        return dest
+
+    def put(self, doi: str, path: Path) -> None:
+        """Store a downloaded PDF; written to a temp name first so readers never see partial files."""
+        target = self._path(doi)
+        # Unique per process and thread: two workers caching the same DOI must not share a temp file
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, target)
+        except OSError as e:
+            logging.warning(f"Cache write failed for {doi}: {e}")
+            tmp.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
 # --- manager that tries strategies in order ---
 class PDFDownloadManager:
-    def __init__(self, strategies: Iterable[PDFDownloader], download_dir: Path):
+    def __init__(
+        self,
+        strategies: Iterable[PDFDownloader],
+        download_dir: Path,
+        cache: Optional[PDFCache] = None,
+        max_workers: int = 8,
+        session: Optional[requests.Session] = None,
+    ):
         self.strategies = list(strategies)
-        self.download_dir = download_dir
-        self.results = []
+        # All strategies go through one pooled session (the given one, else the first
+        # strategy's), so a DOI's Unpaywall, Crossref, Sci-Hub and PDF requests share connections
+        if session is None and self.strategies:
+            session = self.strategies[0].session
+        self.session = session
+        for s in self.strategies:
+            s.session = session
+        self.download_dir = Path(download_dir)
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = cache
+        # DOIs downloaded concurrently by download(); the work is network-bound
+        self.max_workers = max_workers
+        # Outcomes as two parallel columns rather than a dict per DOI (see results)
+        self._result_dois: list[str] = []
+        self._result_ok: list[bool] = []
+        self._results_lock = threading.Lock()
+        # Summary CSV written row by row during download(), so it survives a crash
+        self.summary_path = self.download_dir / SUMMARY_FILENAME
+        self._summary_fp = None
+        self._summary = None
+        self._summary_started = False
 
-    def download(self, dois) -> Optional[object]:
+    def prefetch(self, dois: Iterable[str]) -> None:
+        """Let strategies that support batched metadata lookups warm their caches."""
+        dois = list(dois)
+        for s in self.strategies:
+            if hasattr(s, "prefetch"):
+                try:
+                    s.prefetch(dois)
+                except Exception as e:
+                    logging.warning(f"Prefetch failed for {s.__class__.__name__}: {e}")
+
+    def close(self) -> None:
+        """Close the summary CSV and the shared session, releasing pooled connections."""
+        self._close_summary()
+        if self.session is not None:
+            self.session.close()
+
+    def warm_up(self) -> None:
+        """
+        Open connections to each strategy's API host and rank the Sci-Hub mirrors in
+        background threads, so DNS, TCP and TLS setup overlap with the start of the
+        run instead of delaying the first DOIs. Warmed connections stay in the pool.
+        """
+        def warm(strategy: PDFDownloader) -> None:
+            api = getattr(strategy, "api", None)
+            if api:
+                parts = urlparse(api)
+                try:
+                    strategy.session.head(f"{parts.scheme}://{parts.netloc}/", headers=api_headers, timeout=5)
+                except requests.RequestException:
+                    pass
+            if isinstance(strategy, SciHubDownloader):
+                strategy._ordered_mirrors()
+
+        for s in self.strategies:
+            threading.Thread(target=warm, args=(s,), name=_thread_prefix(f"warm-{s.__class__.__name__}"), daemon=True).start()
+
+    def _open_summary(self) -> None:
+        with self._results_lock:
+            if self._summary_fp is not None:
+                return
+            # Later download() calls on the same manager append to the first one's file
+            mode = "a" if self._summary_started else "w"
+            self._summary_fp = open(self.summary_path, mode, newline="", encoding="utf-8")
+            self._summary = csv.writer(self._summary_fp)
+            if not self._summary_started:
+                self._summary.writerow(SUMMARY_FIELDS)
+                self._summary_started = True
+
+    def _close_summary(self) -> None:
+        with self._results_lock:
+            if self._summary_fp is not None:
+                self._summary_fp.close()
+                self._summary_fp = self._summary = None
+
+    def _record(self, doi: str, success: bool) -> Tuple[str, str]:
+        with self._results_lock:
+            self._result_dois.append(doi)
+            self._result_ok.append(success)
+            if self._summary is not None:
+                self._summary.writerow((doi, success))
+                self._summary_fp.flush()
+        return doi, "success" if success else "fail"
+
+    @property
+    def results(self) -> list[dict]:
+        """Outcomes so far as [{"doi": ..., "success": ...}], built on demand from the columns."""
+        with self._results_lock:
+            return [{"doi": d, "success": ok} for d, ok in zip(self._result_dois, self._result_ok)]
+
+    def result_columns(self) -> dict[str, list]:
+        """Outcomes so far as {"doi": [...], "success": [...]}, e.g. for pd.DataFrame."""
+        with self._results_lock:
+            return {"doi": list(self._result_dois), "success": list(self._result_ok)}
+
+    def result_counts(self) -> Tuple[int, int]:
+        """(succeeded, failed) so far, without materializing any rows."""
+        with self._results_lock:
+            succeeded = sum(self._result_ok)
+            return succeeded, len(self._result_ok) - succeeded
+
+    def _download_one(self, doi: str, stop_event: Optional[threading.Event] = None) -> Optional[Tuple[str, str]]:
+        """Run the strategy chain for one DOI; returns None if skipped because stop_event was set."""
+        if stop_event is not None and stop_event.is_set():
+            return None
+
+        logging.info(f"--- Starting download process for DOI: {doi} ---")
+        existing = self.download_dir / f"{_sanitize_doi(doi)}.pdf"
+        if existing.exists() and existing.stat().st_size > EXISTING_PDF_MIN_BYTES:
+            logging.info(f"SKIP {doi}: already downloaded to {existing}")
+            return self._record(doi, True)
+        if self.cache is not None and self.cache.get(doi, existing):
+            logging.info(f"CACHE HIT for {doi}. Copied to: {existing}")
+            return self._record(doi, True)
+
+        for s in self.strategies:
+            logging.info(f"Trying strategy: {s.__class__.__name__}")
+            try:
+                # Only pass email to UnpaywallDownloader
+                if isinstance(s, UnpaywallDownloader):
+                    path = s.try_download(doi, email=daily_email(date.today().isoformat()))
+                else:
+                    path = s.try_download(doi)
+
+                if path:
+                    logging.info(f"SUCCESS with {s.__class__.__name__}. Saved to: {path}")
+                    if self.cache is not None:
+                        self.cache.put(doi, path)
+                    return self._record(doi, True)
+                else:
+                    logging.warning(f"FAIL with {s.__class__.__name__}. PDF not found.")
+            except Exception as e:
+                logging.error(f"ERROR during {s.__class__.__name__} strategy: {e}", exc_info=True)
+
+        logging.error(f"No PDF found for {doi} after all strategies.")
+        return self._record(doi, False)
+
+    def download(self, dois, stop_event: Optional[threading.Event] = None) -> Optional[object]:
         """
         Accept a single DOI (str) or an iterable/list of DOIs.
-        Regenerates the email every 50 downloads and passes the email only to UnpaywallDownloader.
+        Up to max_workers DOIs are processed concurrently; each DOI still tries strategies in order.
+        Passes UnpaywallDownloader (only) an email that stays the same for the whole day.
+        Setting stop_event skips DOIs that have not started yet.
         Returns a tuple (doi, "success"|"fail") for a single DOI input, or a list of such tuples for many.
         """
         # Normalize input to an iterable and detect single vs multiple
@@ -326,57 +1342,76 @@ class PDFDownloadManager:
         else:
             dois_iter = list(dois)
 
-        results_list = []
-        # initial email for the first batch
-        current_email = generate_random_email()
-        logging.info(f"Starting download for {len(dois_iter)} DOI(s). Initial email generated.")
-
-        for idx, doi in enumerate(dois_iter):
-            # regenerate every 50 downloads (after the first batch)
-            if idx > 0 and idx % 50 == 0:
-                current_email = generate_random_email()
-                logging.info(f"Regenerated email for batch starting at index {idx}.")
-
-            logging.info(f"--- Starting download process for DOI: {doi} ---")
-            doi_result = ("", "fail")
-            for s in self.strategies:
-                logging.info(f"Trying strategy: {s.__class__.__name__}")
-                try:
-                    # Only pass email to UnpaywallDownloader
-                    if isinstance(s, UnpaywallDownloader):
-                        path = s.try_download(doi, email=current_email)
-                    else:
-                        path = s.try_download(doi)
-
-                    if path:
-                        logging.info(f"SUCCESS with {s.__class__.__name__}. Saved to: {path}")
-                        self.results.append({"doi": doi, "success": True})
-                        doi_result = (doi, "success")
-                        break
-                    else:
-                        logging.warning(f"FAIL with {s.__class__.__name__}. PDF not found.")
-                except Exception as e:
-                    logging.error(f"ERROR during {s.__class__.__name__} strategy: {e}", exc_info=True)
-
-            if doi_result[1] == "fail":
-                logging.error(f"No PDF found for {doi} after all strategies.")
-                self.results.append({"doi": doi, "success": False})
+        if len(dois_iter) > 1:
+            self.warm_up()
+            self.prefetch(dois_iter)
 
-            results_list.append(doi_result)
+        logging.info(f"Starting download for {len(dois_iter)} DOI(s).")
+        self._open_summary()
+        workers = max(1, min(self.max_workers, len(dois_iter)))
+        if workers == 1:
+            outcomes = [self._download_one(d, stop_event) for d in dois_iter]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=_thread_prefix("doi")) as pool:
+                outcomes = list(pool.map(self._download_one, dois_iter, [stop_event] * len(dois_iter)))
+        results_list = [r for r in outcomes if r is not None]
 
         # return single tuple for single input, else list
         return results_list[0] if single_input and results_list else results_list
 
+    def download_iter(self, dois: Iterable[str], stop_event: Optional[threading.Event] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Like download(), but consumes dois lazily and yields (doi, "success"|"fail") as
+        each DOI finishes, in completion order. At most 2 * max_workers DOIs are queued
+        at a time, so memory stays flat however long the input is. Crossref metadata
+        is prefetched for each batch of DOIs pulled from the input.
+        """
+        workers = max(1, self.max_workers)
+        window = 2 * workers
+        doi_iter = iter(dois)
+        self.warm_up()
+        self._open_summary()
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=_thread_prefix("doi"))
+        try:
+            pending = set()
+            exhausted = False
+            while True:
+                if not exhausted and len(pending) < window:
+                    batch = list(itertools.islice(doi_iter, window - len(pending)))
+                    exhausted = not batch
+                    if len(batch) > 1:
+                        self.prefetch(batch)
+                    pending.update(pool.submit(self._download_one, d, stop_event) for d in batch)
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    outcome = fut.result()
+                    if outcome is not None:
+                        yield outcome
+        finally:
+            # A caller that stops iterating early shouldn't leave queued DOIs running
+            pool.shutdown(wait=True, cancel_futures=True)
+
     def save_results_to_csv(self):
-        """Saves the download results to a CSV file in the download directory."""
-        if not self.results:
+        """
+        Finish the download summary CSV in the download directory. Rows are already
+        streamed there by download(); this closes the file, or writes it from
+        the recorded results if nothing was streamed.
+        """
+        if not self._result_dois:
             logging.warning("No results to save.")
             return
 
-        results_df = pd.DataFrame(self.results)
-        output_path = self.download_dir / "download_summary.csv"
-        results_df.to_csv(output_path, index=False)
-        logging.info(f"Download summary saved to {output_path}")
+        if self._summary_started:
+            self._close_summary()
+        else:
+            with open(self.summary_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(SUMMARY_FIELDS)
+                with self._results_lock:
+                    writer.writerows(zip(self._result_dois, self._result_ok))
+        logging.info(f"Download summary saved to {self.summary_path}")
 
 
 # --- example usage ---
@@ -388,22 +1423,31 @@ if __name__ == "__main__":
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
+    import pandas as pd  # only the script entry point reads the input CSV with pandas
+
     download_dir = Path("./fulldownloads")
     try:
-        dois = pd.read_csv("sample_doi.csv")["doi"].tolist()
+        # Pull the bare DOI out of each cell (URLs, "doi:" prefixes) in one vectorized
+        # pass, dropping blanks, non-DOIs and duplicates before any request is made
+        raw = pd.read_csv("sample_doi.csv", usecols=["doi"], dtype={"doi": "string"})["doi"]
+        dois = raw.str.extract(_DOI_RE, expand=False).dropna().drop_duplicates().tolist()
     except FileNotFoundError:
         logging.error("'sample_doi.csv' not found. Please create it with a 'doi' column.")
         dois = []
 
+    session = build_session()
     strategies = [
-        UnpaywallDownloader(headers=headers, download_dir=download_dir),
-        CrossrefDownloader(headers=headers, download_dir=download_dir),
-        SciHubDownloader(headers=headers, download_dir=download_dir, mirrors=scihub_mirrors),
+        UnpaywallDownloader(headers=headers, download_dir=download_dir, session=session),
+        CrossrefDownloader(headers=headers, download_dir=download_dir, session=session),
+        SciHubDownloader(headers=headers, download_dir=download_dir, mirrors=scihub_mirrors, session=session),
     ]
-    manager = PDFDownloadManager(strategies=strategies, download_dir=download_dir)
+    manager = PDFDownloadManager(strategies=strategies, download_dir=download_dir, session=session)
     
     if dois:
-        # single call handles list of DOIs and will regenerate email every 50 downloads
-        manager.download(dois)
+        # single call handles the whole list of DOIs
+        try:
+            manager.download(dois)
+        finally:
+            manager.close()
         manager.save_results_to_csv()
 # --- end of file ---
@@ -1,81 +1,213 @@
 # %%
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-import time
+import atexit
 import os
+import re
+import shutil
+import threading
+import time
 from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+import requests
+
+_DISPOSITION_NAME_RE = re.compile(r"""filename\*?\s*=\s*(?:UTF-8'[^']*')?"?([^";]+)"?""", re.IGNORECASE)
+_UNSAFE_NAME_RE = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+def _pdf_file_name(response, url):
+    """
+    File name for a fetched PDF: the server's Content-Disposition name when given,
+    else the URL's host and full path flattened to one safe name, so that different
+    URLs ending in the same segment (e.g. .../1428/pdf) don't overwrite each other.
+    """
+    match = _DISPOSITION_NAME_RE.search(response.headers.get("Content-Disposition", ""))
+    if match:
+        name = os.path.basename(unquote(match.group(1)).strip().replace("\\", "/"))
+    else:
+        parts = urlparse(url)
+        name = f"{parts.netloc}{parts.path}"
+    name = _UNSAFE_NAME_RE.sub("_", name).strip("._") or "download"
+    if not name.lower().endswith(".pdf"):
+        name += ".pdf"
+    return name
+
 
-def download_pdf_headless(url, download_folder=None):
+def _wait_for_pdf(download_folder, timeout=60, poll=0.25, quiet=0.5):
+    """
+    Wait for Chrome to finish a download into download_folder and return the PDF's
+    file name, or None on timeout. Chrome writes to a .crdownload file and renames it
+    when done, so a .pdf whose size hasn't changed for `quiet` seconds while no
+    .crdownload remains is complete. One scandir per poll supplies names and sizes.
+    """
+    deadline = time.monotonic() + timeout
+    last_seen = None
+    stable_since = None
+    while time.monotonic() < deadline:
+        pdf = None
+        in_progress = False
+        with os.scandir(download_folder) as entries:
+            for entry in entries:
+                if entry.name.endswith('.crdownload'):
+                    in_progress = True
+                elif pdf is None and entry.name.endswith('.pdf'):
+                    pdf = (entry.name, entry.stat().st_size)
+        if pdf and not in_progress:
+            now = time.monotonic()
+            if pdf != last_seen:
+                last_seen, stable_since = pdf, now
+            elif now - stable_since >= quiet:
+                return pdf[0]
+        time.sleep(poll)
+    return None
+
+
+class HeadlessChrome:
+    """
+    One headless Chrome instance reused for many downloads, so the 1-3 s browser
+    start-up is paid once instead of per URL. The driver starts on first use and
+    is quit by close() (registered with atexit by download_pdf_headless).
+    Not thread-safe: downloads are serialized with a lock.
+    """
+
+    def __init__(self):
+        self._driver = None
+        self._lock = threading.Lock()
+
+    def _get_driver(self):
+        if self._driver is None:
+            # Imported on first use so importing this module doesn't load selenium
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+
+            # Setup chrome options to download PDF instead of opening it
+            chrome_options = Options()
+            chrome_options.add_argument("--headless=new") # Use the new headless mode
+            chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--window-size=1920,1080")
+            prefs = {
+                "download.prompt_for_download": False,
+                "download.directory_upgrade": True,
+                "plugins.always_open_pdf_externally": True,
+            }
+            chrome_options.add_experimental_option("prefs", prefs)
+
+            print("Initializing Chrome driver...")
+            self._driver = webdriver.Chrome(options=chrome_options)
+        return self._driver
+
+    def download(self, url, download_folder):
+        """Download url into download_folder (emptied first); returns the file path or None."""
+        with self._lock:
+            # Clear the downloads folder before starting
+            print(f"Clearing download folder: {download_folder}")
+            shutil.rmtree(download_folder, ignore_errors=True)
+            Path(download_folder).mkdir(parents=True, exist_ok=True)
+
+            driver = self._get_driver()
+            # The folder can differ per call, so it is set on the live browser rather than in prefs
+            driver.execute_cdp_cmd(
+                "Page.setDownloadBehavior",
+                {"behavior": "allow", "downloadPath": str(Path(download_folder).resolve())},
+            )
+
+            print(f"Navigating to {url}")
+            driver.get(url)
+
+            # Wait for the download to complete
+            print(f"Waiting for download to complete in {download_folder}...")
+            downloaded_file = _wait_for_pdf(download_folder, timeout=60)
+
+        if downloaded_file:
+            return os.path.join(download_folder, downloaded_file)
+        return None
+
+    def fetch_with_cookies(self, url, download_folder, landing_url=None):
+        """
+        Open landing_url (default: the site root) in the browser only to pick up its
+        cookies, then stream url with requests using those cookies and the browser's
+        user agent, skipping PDF rendering and Chrome's download machinery.
+        Returns the file path, or None if the response isn't a PDF.
+        """
+        parts = urlparse(url)
+        landing_url = landing_url or f"{parts.scheme}://{parts.netloc}/"
+        with self._lock:
+            driver = self._get_driver()
+            print(f"Collecting cookies from {landing_url}")
+            driver.get(landing_url)
+            cookies = driver.get_cookies()
+            user_agent = driver.execute_script("return navigator.userAgent")
+
+        session = requests.Session()
+        for c in cookies:
+            session.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+
+        Path(download_folder).mkdir(parents=True, exist_ok=True)
+        part_path = None
+        try:
+            with session.get(url, headers={"User-Agent": user_agent}, stream=True, timeout=30) as r:
+                chunks = r.iter_content(64 * 1024)
+                first = next(chunks, b"")
+                if r.status_code != 200 or not first.startswith(b"%PDF"):
+                    print(f"Direct fetch did not return a PDF (status {r.status_code})")
+                    return None
+                full_path = os.path.join(download_folder, _pdf_file_name(r, r.url))
+                # Written under a temporary name and renamed when complete, so an
+                # interrupted fetch never leaves a truncated .pdf behind
+                part_path = f"{full_path}.{threading.get_ident()}.part"
+                with open(part_path, "wb") as f:
+                    f.write(first)
+                    for chunk in chunks:
+                        f.write(chunk)
+                os.replace(part_path, full_path)
+        except (requests.RequestException, OSError) as e:
+            print(f"Direct fetch failed: {e}")
+            if part_path and os.path.exists(part_path):
+                os.remove(part_path)
+            return None
+        finally:
+            session.close()
+        return full_path
+
+    def close(self):
+        with self._lock:
+            if self._driver is not None:
+                self._driver.quit()
+                self._driver = None
+                print("Driver quit.")
+
+
+_browser = None
+
+
+def download_pdf_headless(url, download_folder=None, landing_url=None):
     """
     Downloads a PDF from a given URL using a headless Chrome browser.
+    The bytes are first fetched directly with the browser's cookies; if that doesn't
+    yield a PDF, Chrome navigates to the URL and downloads it itself.
+    The browser is shared by all calls and quit when the program exits.
 
     :param url: The URL of the PDF to download.
     :param download_folder: The folder to save the downloaded file in. Defaults to a 'downloads' subfolder in the current working directory.
+    :param landing_url: Page whose cookies unlock the PDF. Defaults to the site root.
     :return: The full path to the downloaded file, or None if the download fails.
     """
+    global _browser
     print("--- Starting Selenium Headless Download ---")
 
     if download_folder is None:
         download_folder = str(Path.cwd() / "downloads")
-    
-    Path(download_folder).mkdir(exist_ok=True)
-
-    # --- Selenium download ---
-    # Setup chrome options to download PDF instead of opening it
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new") # Use the new headless mode
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-
-    # Clear the downloads folder before starting
-    print(f"Clearing download folder: {download_folder}")
-    for f in os.listdir(download_folder):
-        try:
-            os.remove(os.path.join(download_folder, f))
-        except OSError as e:
-            print(f"Error removing file {f}: {e}")
-
-    prefs = {
-        "download.default_directory": download_folder,
-        "download.prompt_for_download": False,
-        "download.directory_upgrade": True,
-        "plugins.always_open_pdf_externally": True,
-    }
-    chrome_options.add_experimental_option("prefs", prefs)
-
-    # Initialize the driver and get the URL
-    print("Initializing Chrome driver...")
-    driver = webdriver.Chrome(options=chrome_options)
-
-    print(f"Navigating to {url}")
-    driver.get(url)
-
-    # Wait for the download to complete
-    print(f"Waiting for download to complete in {download_folder}...")
-    downloaded_file = None
-    timeout = 60  # seconds
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        # Check for a fully downloaded PDF file that is not a temporary download file
-        downloaded_files = [f for f in os.listdir(download_folder) if f.endswith('.pdf') and '.crdownload' not in f]
-        if downloaded_files:
-            # Check if file size is stable
-            file_path = os.path.join(download_folder, downloaded_files[0])
-            initial_size = os.path.getsize(file_path)
-            time.sleep(2) # wait a moment to see if the file is still growing
-            if initial_size == os.path.getsize(file_path):
-                downloaded_file = downloaded_files[0]
-                break
-        time.sleep(1)
-
-    driver.quit()
-    print("Driver quit.")
-
-    if downloaded_file:
-        full_path = os.path.join(download_folder, downloaded_file)
+
+    if _browser is None:
+        _browser = HeadlessChrome()
+        atexit.register(_browser.close)
+
+    full_path = _browser.fetch_with_cookies(url, download_folder, landing_url)
+    if not full_path:
+        full_path = _browser.download(url, download_folder)
+    if full_path:
         print(f"Download complete. File: {full_path}")
         return full_path
     else:
@@ -1,40 +1,56 @@
+import functools
+import os
 import random
 import re
 
-import string
+# DOI pattern used by _sanitize_doi, case-insensitive
+_DOI_RE = re.compile(r'(10\.\d{4,9}/[-._;()/:A-Z0-9]+)', re.IGNORECASE)
+# Domains used by generate_random_email
+_EMAIL_DOMAINS = ('gmail.com', 'outlook.com', 'live.com', 'yahoo.com')
+# Characters that can't appear in file names, mapped to '_' in one pass
+_DOI_TRANS = str.maketrans({'/': '_', ':': '_'})
+
+def generate_random_email(rng: random.Random | None = None):
+    """
+    Generate a random valid email address with common domains.
+    The username is 6-12 hex characters from os.urandom, or from rng when given
+    (a seeded generator makes the address reproducible).
+    """
+    # Random username: 3-6 bytes -> 6-12 hex characters
+    if rng is None:
+        username = os.urandom(random.randint(3, 6)).hex()
+        domain = random.choice(_EMAIL_DOMAINS)
+    else:
+        username = rng.randbytes(rng.randint(3, 6)).hex()
+        domain = rng.choice(_EMAIL_DOMAINS)
 
-def generate_random_email():
-    """Generate a random valid email address with common domains."""
-    domains = ['gmail.com', 'outlook.com', 'live.com', 'yahoo.com']
-    
-    # Generate random username (5-12 characters)
-    username_length = random.randint(5, 12)
-    username = ''.join(random.choices(string.ascii_lowercase + string.digits, k=username_length))
-    
-    # Select random domain
-    domain = random.choice(domains)
-    
     return f"{username}@{domain}"
 
+
+@functools.lru_cache(maxsize=1)
+def daily_email(day: str) -> str:
+    """
+    Email for the Unpaywall ?email= parameter, stable for a given day (e.g. date.today().isoformat())
+    so every request that day shares one rate-limit key. PAPER_HUNTER_EMAIL wins when set.
+    """
+    if polite_email:
+        return polite_email
+    # Seed a private generator so the global random state is left alone
+    return generate_random_email(random.Random(day))
+
+@functools.lru_cache(maxsize=8192)
 def _sanitize_doi(doi: str) -> str:
     """
     Extracts a DOI from a string (e.g., a URL) and sanitizes it for use as a filename.
     It handles DOIs provided as full URLs or just the DOI string itself.
+    Cached, since the same DOI is sanitized several times per download.
     """
-    # Regex to find a DOI pattern, case-insensitive
-    doi_regex = r'(10\.\d{4,9}/[-._;()/:A-Z0-9]+)'
-    
     # Search for the DOI pattern in the input string
-    match = re.search(doi_regex, doi, re.IGNORECASE)
+    match = _DOI_RE.search(doi)
     
-    if match:
-        # Extract the DOI from the matched group
-        extracted_doi = match.group(1)
-        # Sanitize the extracted DOI for filesystem-safe name
-        return extracted_doi.replace('/', '_').replace(':', '_')
-    else:
-        # If no DOI pattern is found, perform a simple sanitization on the original string as a fallback
-        return doi.replace('/', '_').replace(':', '_')
+    # Sanitize the extracted DOI for filesystem-safe name; if no DOI pattern is
+    # found, sanitize the original string as a fallback
+    return (match.group(1) if match else doi).translate(_DOI_TRANS)
     
 
 headers = {
@@ -42,6 +58,17 @@ headers = {
     }
 
 
+# Contact address for the Crossref/Unpaywall "polite pool" (faster, less throttled).
+# Set PAPER_HUNTER_EMAIL to use it; it is sent as-is and never rotated.
+polite_email = os.environ.get("PAPER_HUNTER_EMAIL", "").strip()
+
+# Headers for the JSON metadata APIs; browser headers above are kept for publishers and mirrors
+api_headers = {
+        "User-Agent": f"paper_hunter/1.0 (mailto:{polite_email})" if polite_email else "paper_hunter/1.0",
+        "Accept": "application/json",
+    }
+
+
 scihub_mirrors = [
         "https://sci-hub.se/",
         "https://sci-hub.st/",